@@ -1,90 +1,94 @@
+import mmap
+import os
 import sys
 import time
-
-class Clause:
-    def __init__(self):
-        self.symbols = {}
-
-    def dimacs(self, literals, variable_map):
-        self.symbols = {}
-        for literal in literals:
-            sign = 1 if literal > 0 else -1
-            variable_index = abs(literal)
-            if variable_index in variable_map:
-                symbol = variable_map[variable_index]
-                self.symbols[symbol] = sign
-            else:
-                raise ValueError(f"Literal {literal} refers to an undefined variable")
-
-    def format(self):
-        parts = []
-        for var, sign in self.symbols.items():
-            if sign == -1:
-                parts.append("-" + var)
-            else:
-                parts.append(var)
-        return " ".join(parts)
+from collections import Counter
 
 class SatInstance:
     def __init__(self):
-        self.symbols = set()
+        self.num_vars = 0
         self.clauses = []
 
     def dimacs_file(self, file):
-        self.symbols = set()
+        self.num_vars = 0
         self.clauses = []
-        variable_map = {}
 
-        with open(file, "r") as f:
-            for line in f:
-                line = line.strip()
-                if line.startswith("c"):
-                    continue
-                elif line.startswith("p cnf"):
-                    parts = line.split()
-                    if len(parts) == 4 and parts[0] == "p" and parts[1] == "cnf":
-                        num_vars = int(parts[2])
-                        for i in range(1, num_vars + 1):
-                            variable_map[i] = f"x{i}"
-                    else:
-                        raise ValueError("Invalid DIMACS preamble")
-                elif line:
-                    literals = [int(l) for l in line.split() if l != '0']
-                    if literals:
-                        clause = Clause()
-                        clause.dimacs(literals, variable_map)
-                        self.clauses.append(clause)
-                        for symbol in clause.symbols:
-                            self.symbols.add(symbol)
-
-        self.symbols = sorted(list(self.symbols), key=lambda s: int(s[1:])) if self.symbols else []
+        # Memory-map the file and slice out whole runs of clause lines between
+        # comment/preamble lines, so the body is tokenized with single
+        # C-level split()/map() passes and no text decoding or per-line
+        # string objects.
+        with open(file, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                body = b""  # mmap cannot map an empty file
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    chunks = []
+                    pos = 0
+                    while pos < size:
+                        first = mm[pos:pos + 1]
+                        if first == b"c":
+                            end = mm.find(b"\n", pos)
+                            pos = size if end == -1 else end + 1  # Skip comment
+                        elif first == b"p":
+                            end = mm.find(b"\n", pos)
+                            if end == -1:
+                                end = size
+                            parts = mm[pos:end].split()
+                            if len(parts) == 4 and parts[0] == b"p" and parts[1] == b"cnf":
+                                self.num_vars = int(parts[2])
+                            else:
+                                raise ValueError("Invalid DIMACS preamble")
+                            pos = end + 1
+                        else:
+                            # Clause lines run until the next comment/preamble line
+                            cuts = [c for c in (mm.find(b"\nc", pos),
+                                                mm.find(b"\np", pos)) if c != -1]
+                            end = min(cuts) + 1 if cuts else size
+                            chunks.append(mm[pos:end])
+                            pos = end
+                    body = b"".join(chunks)
+
+        clause = []
+        for literal in map(int, body.split()):
+            if literal == 0:
+                if clause:
+                    self._append_clause(clause)
+                    clause = []
+            else:
+                clause.append(literal)
+        if clause:
+            self._append_clause(clause)
+
+    def _append_clause(self, clause):
+        if max(clause) > self.num_vars or -min(clause) > self.num_vars:
+            bad = max(clause, key=abs)
+            raise ValueError(f"Literal {bad} refers to an undefined variable")
+        self.clauses.append(clause)
 
     def is_satisfied(self, assignment):
+        """assignment is a sequence indexed by variable with values -1/0/+1."""
         for clause in self.clauses:
-            satisfied = False
-            for symbol, sign in clause.symbols.items():
-                if symbol in assignment and assignment[symbol] == sign:
-                    satisfied = True
-                    break
-            if not satisfied:
+            if not any((assignment[l] if l > 0 else -assignment[-l]) == 1
+                       for l in clause):
                 return False
         return True
 
 def convert_to_clause_list(instance):
     """
-    Convert SatInstance.clauses (list of Clause objects)
-    to list of frozensets of integers for dp()
+    Convert SatInstance.clauses (lists of signed literals)
+    to a list of frozensets of integers for dp(), dropping
+    duplicate clauses and tautologies
     """
-    symbol_to_int = {s: i + 1 for i, s in enumerate(instance.symbols)}
+    seen = set()
     clause_list = []
-
     for clause in instance.clauses:
-        clause_lits = set()
-        for symbol, sign in clause.symbols.items():
-            lit = symbol_to_int[symbol] * sign
-            clause_lits.add(lit)
-        clause_list.append(frozenset(clause_lits))
-
+        literals = frozenset(clause)
+        if any(-lit in literals for lit in literals):
+            continue  # Tautology, always true
+        if literals not in seen:
+            seen.add(literals)
+            clause_list.append(literals)
     return clause_list
 
 def dp(clauses):
@@ -93,31 +97,92 @@ def dp(clauses):
     clauses: list of frozensets, e.g. [{1, -2}, {-1, 3}, {-2}]
     returns: True if SAT, False if UNSAT
     """
+    # Dedup up front so the duplicate-free guarantee convert_to_clause_list()
+    # establishes also holds when dp() is handed a raw clause list, and stays
+    # in force through every elimination round.
+    clauses = list(dict.fromkeys(clauses))
     if frozenset() in clauses:
         return False
-    if not clauses:
-        return True
-
-    variables = set(abs(lit) for clause in clauses for lit in clause)
-    if not variables:
-        return True
-
-    var = next(iter(variables))
 
-    pos_clauses = [c for c in clauses if var in c]
-    neg_clauses = [c for c in clauses if -var in c]
-    rest_clauses = [c for c in clauses if var not in c and -var not in c]
+    # Occurrence counts are built once and updated as clauses are added and
+    # removed, instead of being recounted from scratch every iteration.
+    pos_count = Counter()
+    neg_count = Counter()
 
-    resolvents = []
-    for c1 in pos_clauses:
-        for c2 in neg_clauses:
-            new_clause = (c1 - {var}) | (c2 - {-var})
-            if not new_clause:
-                return False
-            resolvents.append(frozenset(new_clause))
+    def count(clause, delta):
+        for lit in clause:
+            if lit > 0:
+                pos_count[lit] += delta
+            else:
+                neg_count[-lit] += delta
+
+    for clause in clauses:
+        count(clause, 1)
+
+    while True:
+        if not clauses:
+            return True
+
+        variables = {v for v, n in pos_count.items() if n} | \
+                    {v for v, n in neg_count.items() if n}
+        if not variables:
+            return True
+
+        # Pure-literal rule: a variable occurring in only one polarity
+        # satisfies every clause containing it, so drop those clauses.
+        pure = {v for v in variables if pos_count[v] == 0 or neg_count[v] == 0}
+        if pure:
+            kept = []
+            for clause in clauses:
+                if any(abs(lit) in pure for lit in clause):
+                    count(clause, -1)
+                else:
+                    kept.append(clause)
+            clauses = kept
+            continue
+
+        # Classical DP heuristic: eliminate the variable with the smallest
+        # resolvent blow-up |pos|*|neg| - |pos| - |neg|.
+        var = min(variables,
+                  key=lambda v: pos_count[v] * neg_count[v] - pos_count[v] - neg_count[v])
+
+        # Single fused pass producing all three buckets.
+        pos_clauses = []
+        neg_clauses = []
+        rest_clauses = []
+        for clause in clauses:
+            if var in clause:
+                pos_clauses.append(clause)
+            elif -var in clause:
+                neg_clauses.append(clause)
+            else:
+                rest_clauses.append(clause)
+
+        for clause in pos_clauses:
+            count(clause, -1)
+        for clause in neg_clauses:
+            count(clause, -1)
+
+        # Dedup resolvents against the kept clauses and each other; without
+        # this, duplicates multiply on every elimination round even though the
+        # distinct-clause count is bounded.
+        resolvents = []
+        have = set(rest_clauses)
+        for c1 in pos_clauses:
+            for c2 in neg_clauses:
+                new_clause = (c1 - {var}) | (c2 - {-var})
+                if any(-lit in new_clause for lit in new_clause):
+                    continue  # Tautological resolvent, always true
+                if not new_clause:
+                    return False
+                new_clause = frozenset(new_clause)
+                if new_clause in have:
+                    continue
+                have.add(new_clause)
+                resolvents.append(new_clause)
+                count(new_clause, 1)
 
-    new_formula = rest_clauses + resolvents
-    return dp(new_formula)
+        clauses = rest_clauses + resolvents
 
 def main():
     if len(sys.argv) != 2:
@@ -148,4 +213,4 @@ def main():
         print(f"An unexpected error occurred: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
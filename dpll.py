@@ -1,141 +1,414 @@
+import heapq
+import mmap
+import os
 import sys
 import time
-
-class Clause:
-    def __init__(self):
-        self.symbols = {}
-
-    def from_dimacs(self, literals, variable_map):
-        self.symbols = {}
-        for literal in literals:
-            sign = 1 if literal > 0 else -1
-            variable_index = abs(literal)
-            if variable_index in variable_map:
-                symbol = variable_map[variable_index]
-                self.symbols[symbol] = sign
-            else:
-                raise ValueError(f"Literal {literal} refers to an undefined variable")
-
-    def __str__(self):
-        tokens = []
-        for symbol, sign in self.symbols.items():
-            token = ""
-            if sign == -1:
-                token += "-"
-            token += symbol
-            tokens.append(token)
-        return " ".join(tokens)
+from array import array
+from collections import deque
 
 class SatInstance:
+    """CNF formula stored as a flat literal pool.
+
+    lit_pool holds every literal of every clause contiguously as int32;
+    clause i is lit_pool[clause_starts[i]:clause_starts[i + 1]]. This costs
+    4 bytes per literal instead of a boxed int per literal in nested lists.
+    """
+
     def __init__(self):
-        self.symbols = set()
-        self.clauses = []
+        self.num_vars = 0
+        self.lit_pool = array('i')
+        self.clause_starts = array('l', [0])
+
+    def num_clauses(self):
+        return len(self.clause_starts) - 1
+
+    def clause(self, cid):
+        return self.lit_pool[self.clause_starts[cid]:self.clause_starts[cid + 1]]
 
     def from_dimacs_file(self, filename):
-        self.symbols = set()
-        self.clauses = []
-        variable_map = {}
-
-        with open(filename, "r") as f:
-            for line in f:
-                line = line.strip()
-                if line.startswith("c"):
-                    continue  # Skip comments
-                elif line.startswith("p cnf"):
-                    parts = line.split()
-                    if len(parts) == 4 and parts[0] == "p" and parts[1] == "cnf":
-                        num_vars = int(parts[2])
-                        # Initialize variable map based on the declared number of variables
-                        for i in range(1, num_vars + 1):
-                            variable_map[i] = f"x{i}"
-                    else:
-                        raise ValueError("Invalid DIMACS preamble")
-                elif line:
-                    literals = [int(l) for l in line.split() if l != '0']
-                    if literals:
-                        clause = Clause()
-                        clause.from_dimacs(literals, variable_map)
-                        self.clauses.append(clause)
-                        for symbol in clause.symbols:
-                            self.symbols.add(symbol)
-
-        self.symbols = sorted(list(self.symbols), key=lambda s: int(s[1:])) if self.symbols else []
+        self.num_vars = 0
+        self.lit_pool = array('i')
+        self.clause_starts = array('l', [0])
+
+        # Memory-map the file and slice out whole runs of clause lines between
+        # comment/preamble lines, so the body is tokenized with single
+        # C-level split()/map() passes and no text decoding or per-line
+        # string objects.
+        with open(filename, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                body = b""  # mmap cannot map an empty file
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    chunks = []
+                    pos = 0
+                    while pos < size:
+                        first = mm[pos:pos + 1]
+                        if first == b"c":
+                            end = mm.find(b"\n", pos)
+                            pos = size if end == -1 else end + 1  # Skip comment
+                        elif first == b"p":
+                            end = mm.find(b"\n", pos)
+                            if end == -1:
+                                end = size
+                            parts = mm[pos:end].split()
+                            if len(parts) == 4 and parts[0] == b"p" and parts[1] == b"cnf":
+                                self.num_vars = int(parts[2])
+                            else:
+                                raise ValueError("Invalid DIMACS preamble")
+                            pos = end + 1
+                        else:
+                            # Clause lines run until the next comment/preamble line
+                            cuts = [c for c in (mm.find(b"\nc", pos),
+                                                mm.find(b"\np", pos)) if c != -1]
+                            end = min(cuts) + 1 if cuts else size
+                            chunks.append(mm[pos:end])
+                            pos = end
+                    body = b"".join(chunks)
+
+        clause = []
+        for literal in map(int, body.split()):
+            if literal == 0:
+                if clause:
+                    self._append_clause(clause)
+                    clause = []
+            else:
+                clause.append(literal)
+        if clause:
+            self._append_clause(clause)
+
+    def _append_clause(self, clause):
+        if max(clause) > self.num_vars or -min(clause) > self.num_vars:
+            bad = max(clause, key=abs)
+            raise ValueError(f"Literal {bad} refers to an undefined variable")
+        self.lit_pool.extend(clause)
+        self.clause_starts.append(len(self.lit_pool))
 
     def is_satisfied(self, assignment):
-        for clause in self.clauses:
-            satisfied = False
-            for symbol, sign in clause.symbols.items():
-                if symbol in assignment and assignment[symbol] == sign:
-                    satisfied = True
-                    break
-            if not satisfied:
+        """assignment is a sequence indexed by variable with values -1/0/+1."""
+        for cid in range(self.num_clauses()):
+            if not any((assignment[l] if l > 0 else -assignment[-l]) == 1
+                       for l in self.clause(cid)):
                 return False
         return True
 
-    def find_unit_clause(self):
-        for clause in self.clauses:
-            if len(clause.symbols) == 1:
-                symbol, sign = next(iter(clause.symbols.items()))
-                return {symbol: sign}
+def _propagate(queue, watches, bin_impl, lit_pool, starts, assign, trail,
+               level, reason, dl):
+    """Unit-propagation kernel: drains the queue, returns the literals of the
+    conflicting clause on conflict and None on success.
+
+    Kept as a standalone function taking the flat arrays so every hot name is
+    a local and the truth-value tests are inline int arithmetic. The body is
+    pure integer/array work over lit_pool/starts/assign, i.e. the part a JIT
+    compiler would take over wholesale. Every implied assignment records its
+    antecedent in reason[] and the current decision level dl in level[] for
+    conflict analysis.
+    """
+    while queue:
+        literal = queue.popleft()
+        # Binary clauses are stored as implication edges, not watched: a true
+        # literal directly forces the other literal of each binary clause it
+        # appears negated in.
+        for implied in bin_impl.get(literal, ()):
+            value = assign[implied] if implied > 0 else -assign[-implied]
+            if value == -1:
+                queue.clear()
+                return [-literal, implied]  # Conflict on a binary clause
+            if value == 0:
+                var = implied if implied > 0 else -implied
+                assign[var] = 1 if implied > 0 else -1
+                level[var] = dl
+                reason[var] = (implied, -literal)
+                trail.append(implied)
+                queue.append(implied)
+        false_lit = -literal
+        watch_list = watches[false_lit]
+        i = 0
+        while i < len(watch_list):
+            cid, blocker = watch_list[i]
+            if (assign[blocker] if blocker > 0 else -assign[-blocker]) == 1:
+                i += 1  # Blocking literal already satisfies the clause
+                continue
+            s = starts[cid]
+            if lit_pool[s] == false_lit:
+                lit_pool[s], lit_pool[s + 1] = lit_pool[s + 1], lit_pool[s]
+            other = lit_pool[s]
+            if other != blocker and \
+                    (assign[other] if other > 0 else -assign[-other]) == 1:
+                watch_list[i] = (cid, other)
+                i += 1
+                continue
+            for k in range(s + 2, starts[cid + 1]):
+                lit = lit_pool[k]
+                if (assign[lit] if lit > 0 else -assign[-lit]) != -1:
+                    # Move the watch to a non-false literal
+                    lit_pool[s + 1], lit_pool[k] = lit_pool[k], lit_pool[s + 1]
+                    watches[lit_pool[s + 1]].append((cid, other))
+                    watch_list[i] = watch_list[-1]
+                    watch_list.pop()
+                    break
+            else:
+                value = assign[other] if other > 0 else -assign[-other]
+                if value == -1:
+                    queue.clear()
+                    return list(lit_pool[s:starts[cid + 1]])  # Both watches false
+                # Unit clause
+                var = other if other > 0 else -other
+                assign[var] = 1 if other > 0 else -1
+                level[var] = dl
+                reason[var] = cid
+                trail.append(other)
+                queue.append(other)
+                watch_list[i] = (cid, other)
+                i += 1
+    return None
+
+def solve_dpll(instance):
+    """Conflict-driven clause learning (CDCL) over a two-watched-literal
+    clause database.
+
+    Each clause keeps its two watched literals in positions 0 and 1, and
+    watches[lit] lists (clause_id, blocker) pairs for clauses watching lit, so
+    assigning a literal only visits clauses watching its negation. Assignments
+    are recorded on a trail with per-variable decision levels and antecedents;
+    on conflict, resolving back to the first unique implication point yields a
+    learned clause and a backjump level instead of chronological flipping.
+    Returns a variable-indexed list of -1/+1 signs if satisfiable, else None.
+    """
+    num_vars = instance.num_vars
+    # Private copies: propagation reorders literals within clauses to keep the
+    # watched pair at the front of each clause's pool segment, and learned
+    # clauses are appended to the pool.
+    lit_pool = array('i', instance.lit_pool)
+    starts = array('l', instance.clause_starts)
+    num_clauses = instance.num_clauses()
+
+    assign = [0] * (num_vars + 1)
+    watches = {}
+    for var in range(1, num_vars + 1):
+        watches[var] = []
+        watches[-var] = []
+
+    # Binary clauses go into an implication graph keyed by the literal whose
+    # truth triggers the implication: (a or b) yields -a -> b and -b -> a.
+    bin_impl = {}
+    units = []
+    for cid in range(num_clauses):
+        s = starts[cid]
+        length = starts[cid + 1] - s
+        if length == 1:
+            units.append(lit_pool[s])
+        elif length == 2:
+            a, b = lit_pool[s], lit_pool[s + 1]
+            bin_impl.setdefault(-a, []).append(b)
+            bin_impl.setdefault(-b, []).append(a)
+        else:
+            watches[lit_pool[s]].append((cid, lit_pool[s + 1]))
+            watches[lit_pool[s + 1]].append((cid, lit_pool[s]))
+
+    trail = []
+    trail_lim = []  # Trail length at each decision; decision level == len()
+    level = [0] * (num_vars + 1)
+    reason = [None] * (num_vars + 1)  # Clause id, (lit, lit) pair, or None
+    queue = deque()
+
+    def enqueue(literal, antecedent=None):
+        var = abs(literal)
+        sign = 1 if literal > 0 else -1
+        if assign[var] != 0:
+            return assign[var] == sign
+        assign[var] = sign
+        level[var] = len(trail_lim)
+        reason[var] = antecedent
+        trail.append(literal)
+        queue.append(literal)
+        return True
+
+    def propagate():
+        return _propagate(queue, watches, bin_impl, lit_pool, starts, assign,
+                          trail, level, reason, len(trail_lim))
+
+    def fails(literal):
+        """True if assigning literal derives both x and -x via binary clauses."""
+        reached = {literal}
+        stack = [literal]
+        while stack:
+            for implied in bin_impl.get(stack.pop(), ()):
+                if -implied in reached:
+                    return True
+                if implied not in reached:
+                    reached.add(implied)
+                    stack.append(implied)
+        return False
+
+    for literal in units:
+        if not enqueue(literal):
+            return None
+    if propagate() is not None:
         return None
 
-    def simplify(self, assignment):
-        new_clauses = []
-        for clause in self.clauses:
-            satisfied = False
-            new_symbols = {}
-            for symbol, sign in clause.symbols.items():
-                if symbol in assignment:
-                    if assignment[symbol] == sign:
-                        satisfied = True
-                        break
+    # Pure-literal elimination at decision level 0: a variable occurring in
+    # one polarity only among not-yet-satisfied clauses can be assigned that
+    # polarity without excluding any model, killing whole subtrees up front.
+    # Polarities are tracked in two bitmasks with bit i set when variable i
+    # occurs positively/negatively.
+    while True:
+        seen_pos = 0
+        seen_neg = 0
+        for cid in range(num_clauses):
+            s = starts[cid]
+            end = starts[cid + 1]
+            clause = lit_pool[s:end]
+            if any((assign[l] if l > 0 else -assign[-l]) == 1 for l in clause):
+                continue  # Already satisfied
+            for lit in clause:
+                if lit > 0:
+                    seen_pos |= 1 << lit
                 else:
-                    new_symbols[symbol] = sign
-            if not satisfied:
-                if not new_symbols:
-                    return None  # Found an empty clause, so it's unsatisfiable
-                new_clause = Clause()
-                new_clause.symbols = new_symbols
-                new_clauses.append(new_clause)
-        new_instance = SatInstance()
-        new_instance.clauses = new_clauses
-        new_instance.symbols = sorted(list(set().union(*(c.symbols for c in new_clauses))), key=lambda s: int(s[1:])) if new_clauses else []
-        return new_instance
-
-def solve_dpll(instance, assignment=None):
-    if assignment is None:
-        assignment = {}
-
-    unit_clause = instance.find_unit_clause()
-    while unit_clause:
-        symbol, sign = next(iter(unit_clause.items()))
-        if symbol in assignment and assignment[symbol] != sign:
-            return None  # Conflict found
-        assignment[symbol] = sign
-        instance = instance.simplify({symbol: sign})
-        if instance is None:
-            return None  # Unsatisfiable
-        if not instance.clauses:
-            return assignment  # All clauses satisfied
-        unit_clause = instance.find_unit_clause()
-
-    if not instance.clauses:
-        return assignment  # All clauses satisfied
-
-    unassigned_symbol = next((s for s in instance.symbols if s not in assignment), None)
-    if unassigned_symbol is None:
-        return assignment
-
-    assignment_true = assignment.copy()
-    assignment_true[unassigned_symbol] = 1
-    result_true = solve_dpll(instance.simplify({unassigned_symbol: 1}), assignment_true)
-    if result_true:
-        return result_true
-
-    assignment_false = assignment.copy()
-    assignment_false[unassigned_symbol] = -1
-    result_false = solve_dpll(instance.simplify({unassigned_symbol: -1}), assignment_false)
-    return result_false
+                    seen_neg |= 1 << -lit
+        changed = False
+        mask = seen_pos ^ seen_neg
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            var = bit.bit_length() - 1
+            if assign[var] == 0:
+                enqueue(var if seen_pos & bit else -var)
+                changed = True
+        if not changed:
+            break
+        if propagate() is not None:
+            return None
+
+    # Failed-literal detection: if the binary implication graph derives a
+    # contradiction from assuming a literal, its negation holds at level 0.
+    for literal in list(bin_impl):
+        if assign[literal if literal > 0 else -literal] == 0 and fails(literal):
+            if not enqueue(-literal) or propagate() is not None:
+                return None
+
+    # VSIDS: per-variable activity bumped for every variable touched by
+    # conflict analysis, with the bump growing geometrically so recent
+    # conflicts dominate. Decisions take the most active unassigned variable
+    # from a lazy max-heap (stale/assigned entries are skipped on pop;
+    # unassignment pushes a fresh entry).
+    activity = [0.0] * (num_vars + 1)
+    var_inc = 1.0
+    order = [(0.0, var) for var in range(1, num_vars + 1)]
+    heapq.heapify(order)
+
+    def antecedent_lits(r):
+        if isinstance(r, tuple):
+            return r
+        return lit_pool[starts[r]:starts[r + 1]]
+
+    # Scratch buffer for analyze(), allocated once: each analysis leaves
+    # seen[] marked exactly on the learned clause's variables and clears those
+    # before returning, so the buffer is all-False between conflicts.
+    seen = [False] * (num_vars + 1)
+
+    def analyze(conflict):
+        """1UIP conflict analysis.
+
+        Walks the trail backward resolving the conflict clause against the
+        antecedents of current-level literals until a single literal from the
+        current decision level remains (the first unique implication point).
+        Returns the learned clause (asserting literal first) and the backjump
+        level.
+        """
+        current = len(trail_lim)
+        learned = []
+        counter = 0
+        resolved = None
+        idx = len(trail) - 1
+        lits = conflict
+        while True:
+            for q in lits:
+                var = abs(q)
+                if resolved is not None and var == abs(resolved):
+                    continue
+                if not seen[var] and level[var] > 0:
+                    seen[var] = True
+                    activity[var] += var_inc
+                    if level[var] == current:
+                        counter += 1
+                    else:
+                        learned.append(q)
+            while not seen[abs(trail[idx])]:
+                idx -= 1
+            resolved = trail[idx]
+            idx -= 1
+            seen[abs(resolved)] = False
+            counter -= 1
+            if counter == 0:
+                break
+            lits = antecedent_lits(reason[abs(resolved)])
+        for q in learned:
+            seen[abs(q)] = False
+        learned.insert(0, -resolved)
+        backjump = max((level[abs(q)] for q in learned[1:]), default=0)
+        return learned, backjump
+
+    def cancel_until(target_level):
+        while len(trail_lim) > target_level:
+            limit = trail_lim.pop()
+            while len(trail) > limit:
+                var = abs(trail.pop())
+                assign[var] = 0
+                reason[var] = None
+                heapq.heappush(order, (-activity[var], var))
+
+    def record(learned):
+        """Adds a learned clause and enqueues its asserting literal."""
+        asserting = learned[0]
+        if len(learned) == 1:
+            enqueue(asserting)
+        elif len(learned) == 2:
+            other = learned[1]
+            bin_impl.setdefault(-asserting, []).append(other)
+            bin_impl.setdefault(-other, []).append(asserting)
+            enqueue(asserting, (asserting, other))
+        else:
+            # The second watch must sit at the backjump level so the watch
+            # invariant holds when the clause is attached.
+            k = max(range(1, len(learned)), key=lambda i: level[abs(learned[i])])
+            learned[1], learned[k] = learned[k], learned[1]
+            cid = len(starts) - 1
+            lit_pool.extend(learned)
+            starts.append(len(lit_pool))
+            watches[learned[0]].append((cid, learned[1]))
+            watches[learned[1]].append((cid, learned[0]))
+            enqueue(asserting, cid)
+
+    while True:
+        conflict = propagate()
+        if conflict is not None:
+            if not trail_lim:
+                return None  # Conflict at decision level 0
+            learned, backjump = analyze(conflict)
+            cancel_until(backjump)
+            record(learned)
+            var_inc *= 1.05
+            if var_inc > 1e100:
+                # Rescale to keep activities in float range; the heap's keys
+                # go stale, so rebuild it from the unassigned variables.
+                var_inc *= 1e-100
+                for var in range(1, num_vars + 1):
+                    activity[var] *= 1e-100
+                order = [(-activity[v], v) for v in range(1, num_vars + 1)
+                         if assign[v] == 0]
+                heapq.heapify(order)
+        else:
+            var = None
+            while order:
+                _, candidate = heapq.heappop(order)
+                if assign[candidate] == 0:
+                    var = candidate
+                    break
+            if var is None:
+                return assign
+            trail_lim.append(len(trail))
+            enqueue(var)
 
 def main():
     if len(sys.argv) != 2:
@@ -147,7 +420,7 @@ def main():
     try:
         instance.from_dimacs_file(input_filename)
         start_time = time.time()
-        assignment = solve_dpll(instance)  # Or solve_sat_dp for the other version
+        assignment = solve_dpll(instance)
         end_time = time.time()
         duration = end_time - start_time
 
@@ -165,4 +438,4 @@ def main():
         print(f"An unexpected error occurred: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
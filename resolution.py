@@ -1,47 +1,184 @@
+import mmap
+import os
 import sys
 import time
 
 def dimacs(file):
-    """Parses a DIMACS CNF file and returns a list of clauses as frozensets of integers."""
+    """Parses a DIMACS CNF file and returns a list of clauses as (pos_mask, neg_mask) pairs.
+
+    Bit i of pos_mask (neg_mask) is set when variable i occurs positively (negatively).
+    """
+    # Memory-map the file and slice out whole runs of clause lines between
+    # comment/preamble lines, so the body is tokenized with single C-level
+    # split()/map() passes and no text decoding or per-line string objects.
+    with open(file, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            body = b""  # mmap cannot map an empty file
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                chunks = []
+                at = 0
+                while at < size:
+                    if mm[at:at + 1] in (b"c", b"p"):
+                        end = mm.find(b"\n", at)
+                        at = size if end == -1 else end + 1  # Skip comment/preamble
+                    else:
+                        # Clause lines run until the next comment/preamble line
+                        cuts = [c for c in (mm.find(b"\nc", at), mm.find(b"\np", at))
+                                if c != -1]
+                        end = min(cuts) + 1 if cuts else size
+                        chunks.append(mm[at:end])
+                        at = end
+                body = b"".join(chunks)
+
     clauses = []
-    file = "input.cnf"
-    with open(file, "r") as f:
-        for line in f:
-            line = line.strip()
-            if line.startswith("c") or line == "" or line.startswith("p"):
-                continue
-            literals = [int(lit) for lit in line.split() if lit != '0']
-            if literals:
-                clauses.append(frozenset(sorted(literals)))
+    pos = 0
+    neg = 0
+    for lit in map(int, body.split()):
+        if lit == 0:
+            if pos or neg:
+                clauses.append((pos, neg))
+                pos = 0
+                neg = 0
+        elif lit > 0:
+            pos |= 1 << lit
+        else:
+            neg |= 1 << -lit
+    if pos or neg:
+        clauses.append((pos, neg))
     return clauses
 
 def resolve(c1, c2):
-    for lit in c1:
-        if -lit in c2:
-            return (c1 - {lit}) | (c2 - {-lit})
-    return None
+    """Yields every non-tautological resolvent of two bitmask clauses."""
+    p1, n1 = c1
+    p2, n2 = c2
+    overlap = (p1 & n2) | (p2 & n1)
+    while overlap:
+        bit = overlap & -overlap
+        overlap ^= bit
+        p_new = (p1 | p2) & ~bit
+        n_new = (n1 | n2) & ~bit
+        if p_new & n_new == 0:
+            yield (p_new, n_new)
+
+_MASK64 = (1 << 64) - 1
+_BLOOM_MASK = (1 << 20) - 1
+
+def fingerprint(clause):
+    """64-bit splitmix-style fingerprint of a bitmask clause."""
+    z = (hash(clause[0]) * 0x9e3779b97f4a7c15 + hash(clause[1])) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xbf58476d1ce4e5b9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94d049bb133111eb) & _MASK64
+    return z ^ (z >> 31)
+
+def signature(mask):
+    """Folds a variable bitmask to 64 bits: bit (v % 64) set for each var v."""
+    sig = 0
+    while mask:
+        sig |= mask & _MASK64
+        mask >>= 64
+    return sig
+
+def subsumes(c1, c2):
+    """True if clause c1 subsumes c2, i.e. every literal of c1 also occurs in c2."""
+    p1, n1 = c1
+    p2, n2 = c2
+    return (p1 & p2) == p1 and (n1 & n2) == n1
+
+def clause_vars(clause):
+    """Yields the variables mentioned by a bitmask clause."""
+    mask = clause[0] | clause[1]
+    while mask:
+        bit = mask & -mask
+        mask ^= bit
+        yield bit.bit_length() - 1
+
+def add_clause(clause, known, by_var, bloom):
+    """Inserts a clause unless it is a tautology or subsumed by a known clause.
+
+    After inserting, removes any known clause the new one subsumes.
+    Returns True if the clause was added.
+    """
+    pos, neg = clause
+    if pos & neg:
+        return False  # Tautology
+    if clause in known:
+        return False
+
+    variables = list(clause_vars(clause))
+
+    # Forward subsumption: a subsuming clause mentions only variables of this
+    # one, so it shows up in at least one of these buckets.
+    for var in variables:
+        for other in by_var.get(var, ()):
+            if subsumes(other, clause):
+                return False
+
+    known.add(clause)
+    fp = fingerprint(clause)
+    bloom[fp & _BLOOM_MASK] = 1
+    bloom[(fp >> 20) & _BLOOM_MASK] = 1
+    for var in variables:
+        by_var.setdefault(var, set()).add(clause)
+
+    # Backward subsumption: any clause this one subsumes must mention every
+    # variable of it, so scanning the smallest bucket suffices.
+    rarest = min(variables, key=lambda v: len(by_var[v]))
+    for other in list(by_var[rarest]):
+        if other != clause and subsumes(clause, other):
+            known.discard(other)
+            for var in clause_vars(other):
+                by_var[var].discard(other)
+    return True
 
 def resolution(clauses):
     """Performs the resolution algorithm. Returns 'UNSAT' if contradiction is found, otherwise 'SAT'."""
-    known = set(clauses)
-    while True:
+    known = set()
+    by_var = {}
+    # Bloom filter in front of known: two bits per clause fingerprint, so most
+    # never-seen resolvents are rejected with two bytearray reads instead of
+    # hashing two big ints against the set. Clauses evicted by subsumption
+    # leave stale bits behind, which only costs a redundant set probe.
+    bloom = bytearray(_BLOOM_MASK + 1)
+    for clause in clauses:
+        if clause == (0, 0):
+            return "Unsatisfiable"
+        add_clause(clause, known, by_var, bloom)
+
+    # Set-of-support: each round only resolves last round's additions against
+    # the whole set. Pairs of older clauses were already resolved in the round
+    # that introduced them, so rerunning them is pure redundancy.
+    fresh = set(known)
+    while fresh:
         new_clauses = set()
-        known_list = list(known)
-
-        for i in range(len(known_list)):
-            for j in range(i + 1, len(known_list)):
-                c1, c2 = known_list[i], known_list[j]
-                resolvent = resolve(c1, c2)
-                if resolvent is not None:
-                    if not resolvent:
+        # Precomputed 64-bit folded signatures give a one-word early reject:
+        # a complementary pair on variable v implies overlapping bits at
+        # (v % 64), so a zero AND proves resolve() would yield nothing. For
+        # instances of at most 64 variables the test is exact.
+        known_list = [(c, signature(c[0]), signature(c[1])) for c in known]
+        fresh_list = [(c, signature(c[0]), signature(c[1]))
+                      for c in fresh if c in known]
+
+        for c1, sp1, sn1 in fresh_list:
+            for c2, sp2, sn2 in known_list:
+                if not ((sp1 & sn2) | (sn1 & sp2)):
+                    continue
+                for resolvent in resolve(c1, c2):
+                    if resolvent == (0, 0):
                         return "Unsatisfiable"
-                    if resolvent not in known:
-                        new_clauses.add(resolvent)
+                    fp = fingerprint(resolvent)
+                    if (bloom[fp & _BLOOM_MASK] and bloom[(fp >> 20) & _BLOOM_MASK]
+                            and resolvent in known):
+                        continue
+                    new_clauses.add(resolvent)
 
-        if not new_clauses:
-            return "Satisfiable"
+        fresh = set()
+        for clause in new_clauses:
+            if add_clause(clause, known, by_var, bloom):
+                fresh.add(clause)
 
-        known.update(new_clauses)
+    return "Satisfiable"
 
 def main():
     if len(sys.argv) != 2:
@@ -65,4 +202,4 @@ def main():
         print(f"An error occurred: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()